@@ -1,11 +1,19 @@
 import pandas as pd
-import psycopg2
+from psycopg2 import sql
+from psycopg2.pool import ThreadedConnectionPool
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+import hashlib
 import logging
-import json
+import threading
+import time
+import weakref
 import os
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional, Callable
 import numpy as np
+import orjson
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 
@@ -20,6 +28,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Fallback text patterns for validity checks on servers without pg_input_is_valid
+VALIDITY_PATTERNS = {
+    'numeric': r'^\s*[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?\s*$',
+    'date': r'^[0-9]{4}-[0-9]{2}-[0-9]{2}'
+}
+
 class QualityCheckType(Enum):
     COMPLETENESS = "completeness"
     ACCURACY = "accuracy"
@@ -38,8 +52,21 @@ class QualityCheckResult:
     error_count: int
     total_count: int
 
+    @property
+    def error_rate(self) -> float:
+        return (self.error_count / self.total_count) * 100 if self.total_count > 0 else 0
+
+@dataclass
+class FusedStatement:
+    query: sql.Composed
+    params: List[Any]
+    # Bound SQL text and prepared statement name, filled in on first execution
+    text: Optional[bytes] = None
+    name: Optional[str] = None
+
 class DatabaseConnection:
-    def __init__(self, dbname: str, user: str, password: str, host: str = 'localhost', port: str = '5432'):
+    def __init__(self, dbname: str, user: str, password: str, host: str = 'localhost', port: str = '5432',
+                 minconn: int = 2, maxconn: int = 16):
         self.connection_params = {
             'dbname': dbname,
             'user': user,
@@ -47,314 +74,495 @@ class DatabaseConnection:
             'host': host,
             'port': port
         }
-
-    def connect(self):
+        # Names prepared on each pooled session, shared by every checker using this pool
+        self._prepared: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._prepared_lock = threading.Lock()
         try:
-            conn = psycopg2.connect(**self.connection_params)
-            logger.info("Successfully connected to database")
-            return conn
+            self.pool = ThreadedConnectionPool(minconn, maxconn, **self.connection_params)
+            conn = self.pool.getconn()
+            self.server_version = conn.server_version
+            self.pool.putconn(conn)
         except Exception as e:
             logger.error(f"Error connecting to database: {str(e)}")
             raise
 
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection, committing on success and rolling back on error"""
+        conn = self.pool.getconn()
+        logger.debug("Borrowed pooled database connection")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.pool.putconn(conn)
+
+    def prepared_statements(self, conn) -> set:
+        """Names of the statements already prepared on a pooled connection's session"""
+        with self._prepared_lock:
+            return self._prepared.setdefault(conn, set())
+
+    def close(self):
+        self.pool.closeall()
+
 class DataQualityChecker:
-    def __init__(self, db_connection: DatabaseConnection):
+    def __init__(self, db_connection: DatabaseConnection, max_workers: int = 8,
+                 cache_size: int = 128, cache_ttl: float = 300):
         self.db = db_connection
+        self.max_workers = max_workers
         self.results: List[QualityCheckResult] = []
 
+        # LRU cache of results keyed on (table, column, check, args), validated against the
+        # per-table pg_stat_user_tables modification counters of exactly the tables each check
+        # reads, and expired after cache_ttl seconds
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Column checks reduce to COUNT(*) plus one conditional count, so any number
+        # of them on the same table can share a single scan
+        self._column_checks = {
+            self.check_completeness: (self._completeness_condition, self._completeness_result),
+            self.check_accuracy: (self._accuracy_condition, self._accuracy_result),
+            self.check_validity: (self._validity_condition, self._validity_result),
+            self.check_timeliness: (self._timeliness_condition, self._timeliness_result)
+        }
+
+        # Standard check suite run by run_quality_checks
+        self.checks = [
+            # Completeness checks
+            (self.check_completeness, 'core.customer', 'email'),
+            (self.check_completeness, 'core.customer', 'phone'),
+            (self.check_completeness, 'core.transaction', 'amount'),
+
+            # Accuracy checks
+            (self.check_accuracy, 'core.customer', 'satisfaction_score', {'min': 0, 'max': 10}),
+            (self.check_accuracy, 'core.customer', 'nps_score', {'min': 0, 'max': 10}),
+            (self.check_accuracy, 'core.transaction', 'status', {'allowed_values': ['COMPLETED', 'PENDING', 'FAILED']}),
+
+            # Consistency checks
+            (self.check_consistency, 'core.transaction', 'customer_id', 'core.customer', 'customer_id'),
+            (self.check_consistency, 'core.transaction', 'branch_id', 'core.branch', 'branch_id'),
+            (self.check_consistency, 'core.transaction', 'product_id', 'core.product', 'product_id'),
+
+            # Validity checks
+            (self.check_validity, 'core.transaction', 'amount', 'numeric'),
+            (self.check_validity, 'core.customer', 'date_of_birth', 'date'),
+            (self.check_validity, 'core.transaction', 'transaction_date', 'date'),
+
+            # Timeliness checks
+            (self.check_timeliness, 'core.transaction', 'transaction_date', 24),
+            (self.check_timeliness, 'core.customer', 'last_interaction_date', 30 * 24)
+        ]
+
+        # The suite's arguments are fixed, so its fused statements are composed once here and
+        # prepared lazily on each pooled connection; any other check set runs unprepared
+        self._column_suite, self._consistency_suite = self._group_checks(self.checks)
+        self._statements: Dict[Tuple, FusedStatement] = {}
+        for table_name, table_checks in self._column_suite.items():
+            keys = tuple(self._column_check_key(table_name, check) for check in table_checks)
+            self._statements[keys] = FusedStatement(*self._column_query(table_name, table_checks))
+        for table_name, references in self._consistency_suite.items():
+            keys = tuple(self._consistency_check_key(table_name, reference) for reference in references)
+            self._statements[keys] = FusedStatement(*self._consistency_query(table_name, references))
+
     def check_completeness(self, table_name: str, column_name: str) -> QualityCheckResult:
         """Check for NULL values in a column"""
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-
-            # Get total count and NULL count
-            cursor.execute(f"""
-                SELECT 
-                    COUNT(*) as total_count,
-                    COUNT({column_name}) as non_null_count
-                FROM {table_name}
-            """)
-            total_count, non_null_count = cursor.fetchone()
-
-            # Calculate completeness percentage
-            completeness = (non_null_count / total_count) * 100 if total_count > 0 else 0
-            passed = completeness >= 95  # Threshold of 95%
-
-            result = QualityCheckResult(
-                check_type=QualityCheckType.COMPLETENESS,
-                table_name=table_name,
-                column_name=column_name,
-                check_date=datetime.now(),
-                passed=passed,
-                details={
-                    'completeness_percentage': completeness,
-                    'null_count': total_count - non_null_count,
-                    'non_null_count': non_null_count
-                },
-                error_count=total_count - non_null_count,
-                total_count=total_count
-            )
-
-            logger.info(f"Completeness check for {table_name}.{column_name}: {completeness:.2f}%")
-            return result
-
-        except Exception as e:
-            logger.error(f"Error in completeness check: {str(e)}")
-            raise
-        finally:
-            cursor.close()
-            conn.close()
+        return self.run_column_checks(table_name, [(self.check_completeness, column_name)])[0]
 
     def check_accuracy(self, table_name: str, column_name: str, validation_rules: Dict[str, Any]) -> QualityCheckResult:
         """Check if values meet specified validation rules"""
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-
-            # Build validation query based on rules
-            validation_conditions = []
-            for rule, value in validation_rules.items():
-                if rule == 'min':
-                    validation_conditions.append(f"{column_name} >= {value}")
-                elif rule == 'max':
-                    validation_conditions.append(f"{column_name} <= {value}")
-                elif rule == 'allowed_values':
-                    values = ", ".join(f"'{v}'" for v in value)
-                    validation_conditions.append(f"{column_name} IN ({values})")
-
-            validation_query = f"""
-                SELECT 
-                    COUNT(*) as total_count,
-                    COUNT(CASE WHEN {' AND '.join(validation_conditions)} THEN 1 END) as valid_count
-                FROM {table_name}
-            """
-
-            cursor.execute(validation_query)
-            total_count, valid_count = cursor.fetchone()
-
-            # Calculate accuracy percentage
-            accuracy = (valid_count / total_count) * 100 if total_count > 0 else 0
-            passed = accuracy >= 98  # Threshold of 98%
-
-            result = QualityCheckResult(
-                check_type=QualityCheckType.ACCURACY,
-                table_name=table_name,
-                column_name=column_name,
-                check_date=datetime.now(),
-                passed=passed,
-                details={
-                    'accuracy_percentage': accuracy,
-                    'invalid_count': total_count - valid_count,
-                    'valid_count': valid_count,
-                    'validation_rules': validation_rules
-                },
-                error_count=total_count - valid_count,
-                total_count=total_count
-            )
-
-            logger.info(f"Accuracy check for {table_name}.{column_name}: {accuracy:.2f}%")
-            return result
-
-        except Exception as e:
-            logger.error(f"Error in accuracy check: {str(e)}")
-            raise
-        finally:
-            cursor.close()
-            conn.close()
+        return self.run_column_checks(table_name, [(self.check_accuracy, column_name, validation_rules)])[0]
 
     def check_consistency(self, table_name: str, column_name: str, reference_table: str, reference_column: str) -> QualityCheckResult:
         """Check referential integrity between tables"""
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-
-            # Check for orphaned records
-            cursor.execute(f"""
-                SELECT COUNT(*) as orphaned_count
-                FROM {table_name} t
-                LEFT JOIN {reference_table} r ON t.{column_name} = r.{reference_column}
-                WHERE r.{reference_column} IS NULL
-            """)
-            orphaned_count = cursor.fetchone()[0]
-
-            # Get total count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            total_count = cursor.fetchone()[0]
-
-            # Calculate consistency percentage
-            consistency = ((total_count - orphaned_count) / total_count) * 100 if total_count > 0 else 0
-            passed = consistency == 100  # Must be 100% for referential integrity
-
-            result = QualityCheckResult(
-                check_type=QualityCheckType.CONSISTENCY,
-                table_name=table_name,
-                column_name=column_name,
-                check_date=datetime.now(),
-                passed=passed,
-                details={
-                    'consistency_percentage': consistency,
-                    'orphaned_count': orphaned_count,
-                    'reference_table': reference_table,
-                    'reference_column': reference_column
-                },
-                error_count=orphaned_count,
-                total_count=total_count
-            )
-
-            logger.info(f"Consistency check for {table_name}.{column_name}: {consistency:.2f}%")
-            return result
-
-        except Exception as e:
-            logger.error(f"Error in consistency check: {str(e)}")
-            raise
-        finally:
-            cursor.close()
-            conn.close()
+        return self.run_consistency_checks(table_name, [(column_name, reference_table, reference_column)])[0]
 
     def check_validity(self, table_name: str, column_name: str, data_type: str) -> QualityCheckResult:
         """Check if values match expected data type"""
+        return self.run_column_checks(table_name, [(self.check_validity, column_name, data_type)])[0]
+
+    def check_timeliness(self, table_name: str, date_column: str, max_age_hours: int) -> QualityCheckResult:
+        """Check if data is up to date"""
+        return self.run_column_checks(table_name, [(self.check_timeliness, date_column, max_age_hours)])[0]
+
+    def run_column_checks(self, table_name: str, checks: List[Tuple]) -> List[QualityCheckResult]:
+        """Run several column checks against one table in a single scan"""
         try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-
-            # Build type validation query
-            if data_type == 'numeric':
-                validation_query = f"""
-                    SELECT 
-                        COUNT(*) as total_count,
-                        COUNT(CASE WHEN {column_name} ~ '^[0-9]+\.?[0-9]*$' THEN 1 END) as valid_count
-                    FROM {table_name}
-                """
-            elif data_type == 'date':
-                validation_query = f"""
-                    SELECT 
-                        COUNT(*) as total_count,
-                        COUNT(CASE WHEN {column_name}::date IS NOT NULL THEN 1 END) as valid_count
-                    FROM {table_name}
-                """
-            else:
-                raise ValueError(f"Unsupported data type: {data_type}")
-
-            cursor.execute(validation_query)
-            total_count, valid_count = cursor.fetchone()
-
-            # Calculate validity percentage
-            validity = (valid_count / total_count) * 100 if total_count > 0 else 0
-            passed = validity == 100  # Must be 100% for data type validity
-
-            result = QualityCheckResult(
-                check_type=QualityCheckType.VALIDITY,
-                table_name=table_name,
-                column_name=column_name,
-                check_date=datetime.now(),
-                passed=passed,
-                details={
-                    'validity_percentage': validity,
-                    'invalid_count': total_count - valid_count,
-                    'valid_count': valid_count,
-                    'data_type': data_type
-                },
-                error_count=total_count - valid_count,
-                total_count=total_count
-            )
-
-            logger.info(f"Validity check for {table_name}.{column_name}: {validity:.2f}%")
-            return result
+            keys = [self._column_check_key(table_name, check) for check in checks]
+            with self.db.connection() as conn, conn.cursor() as cursor:
+                return self._cached_checks(
+                    cursor, [table_name], keys, checks,
+                    lambda pending: self._scan_column_checks(cursor, table_name, pending)
+                )
 
         except Exception as e:
-            logger.error(f"Error in validity check: {str(e)}")
+            logger.error(f"Error in column checks for {table_name}: {str(e)}")
             raise
-        finally:
-            cursor.close()
-            conn.close()
 
-    def check_timeliness(self, table_name: str, date_column: str, max_age_hours: int) -> QualityCheckResult:
-        """Check if data is up to date"""
+    def _column_check_key(self, table_name: str, check: Tuple) -> Tuple:
+        check_func, column_name, *args = check
+        return (table_name, column_name, check_func.__name__, repr(args))
+
+    def _column_query(self, table_name: str, checks: List[Tuple]) -> Tuple[sql.Composed, List[Any]]:
+        counts = []
+        params = []
+        for check_func, column_name, *args in checks:
+            build_condition, _ = self._column_checks[check_func]
+            condition, condition_params = build_condition(column_name, *args)
+            counts.append(sql.SQL("COUNT(CASE WHEN {} THEN 1 END)").format(condition))
+            params.extend(condition_params)
+
+        query = sql.SQL("""
+            SELECT 
+                COUNT(*) as total_count,
+                {counts}
+            FROM {table}
+        """).format(counts=sql.SQL(",\n                ").join(counts), table=self._table_identifier(table_name))
+        return query, params
+
+    def _scan_column_checks(self, cursor, table_name: str, checks: List[Tuple]) -> List[QualityCheckResult]:
+        total_count, *matched_counts = self._execute_checks(
+            cursor, tuple(self._column_check_key(table_name, check) for check in checks),
+            lambda: self._column_query(table_name, checks)
+        )
+
+        results = []
+        for (check_func, column_name, *args), matched_count in zip(checks, matched_counts):
+            _, build_result = self._column_checks[check_func]
+            results.append(build_result(table_name, column_name, *args, total_count, matched_count))
+        return results
+
+    def run_consistency_checks(self, table_name: str, references: List[Tuple[str, str, str]]) -> List[QualityCheckResult]:
+        """Check referential integrity against several reference tables in a single scan"""
         try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-
-            # Check for outdated records
-            cursor.execute(f"""
-                SELECT 
-                    COUNT(*) as total_count,
-                    COUNT(CASE WHEN {date_column} >= NOW() - INTERVAL '{max_age_hours} hours' THEN 1 END) as recent_count
-                FROM {table_name}
-            """)
-            total_count, recent_count = cursor.fetchone()
-
-            # Calculate timeliness percentage
-            timeliness = (recent_count / total_count) * 100 if total_count > 0 else 0
-            passed = timeliness >= 95  # Threshold of 95%
-
-            result = QualityCheckResult(
-                check_type=QualityCheckType.TIMELINESS,
-                table_name=table_name,
-                column_name=date_column,
-                check_date=datetime.now(),
-                passed=passed,
-                details={
-                    'timeliness_percentage': timeliness,
-                    'outdated_count': total_count - recent_count,
-                    'recent_count': recent_count,
-                    'max_age_hours': max_age_hours
-                },
-                error_count=total_count - recent_count,
-                total_count=total_count
-            )
-
-            logger.info(f"Timeliness check for {table_name}.{date_column}: {timeliness:.2f}%")
-            return result
+            keys = [self._consistency_check_key(table_name, reference) for reference in references]
+            tables = [table_name] + [reference_table for _, reference_table, _ in references]
+            with self.db.connection() as conn, conn.cursor() as cursor:
+                return self._cached_checks(
+                    cursor, tables, keys, references,
+                    lambda pending: self._scan_consistency_checks(cursor, table_name, pending)
+                )
 
         except Exception as e:
-            logger.error(f"Error in timeliness check: {str(e)}")
+            logger.error(f"Error in consistency checks for {table_name}: {str(e)}")
             raise
-        finally:
-            cursor.close()
-            conn.close()
+
+    def _consistency_check_key(self, table_name: str, reference: Tuple[str, str, str]) -> Tuple:
+        column_name, reference_table, reference_column = reference
+        return (table_name, column_name, 'check_consistency', repr((reference_table, reference_column)))
+
+    def _consistency_query(self, table_name: str, references: List[Tuple[str, str, str]]) -> Tuple[sql.Composed, List[Any]]:
+        counts = []
+        for column_name, reference_table, reference_column in references:
+            counts.append(sql.SQL(
+                "COUNT(*) FILTER (WHERE NOT EXISTS (SELECT 1 FROM {} r WHERE {} = {}))"
+            ).format(
+                self._table_identifier(reference_table),
+                sql.Identifier('r', reference_column), sql.Identifier('t', column_name)
+            ))
+
+        # Count orphaned records for every reference alongside the total;
+        # anti-joins keep duplicate reference keys from fanning out the base rows
+        query = sql.SQL("""
+            SELECT 
+                COUNT(*) as total_count,
+                {counts}
+            FROM {table} t
+        """).format(
+            counts=sql.SQL(",\n                ").join(counts),
+            table=self._table_identifier(table_name)
+        )
+        return query, []
+
+    def _scan_consistency_checks(self, cursor, table_name: str, references: List[Tuple[str, str, str]]) -> List[QualityCheckResult]:
+        total_count, *orphaned_counts = self._execute_checks(
+            cursor, tuple(self._consistency_check_key(table_name, reference) for reference in references),
+            lambda: self._consistency_query(table_name, references)
+        )
+
+        return [
+            self._consistency_result(table_name, *reference, total_count, orphaned_count)
+            for reference, orphaned_count in zip(references, orphaned_counts)
+        ]
+
+    def _cached_checks(self, cursor, tables: List[str], keys: List[Tuple], checks: List[Tuple],
+                       run_checks: Callable[[List[Tuple]], List[QualityCheckResult]]) -> List[QualityCheckResult]:
+        """Serve results from the cache while the tables they read are unchanged, running only the rest"""
+        version = self._table_version(cursor, tables)
+        if version is None:
+            return run_checks(checks)
+
+        with self._cache_lock:
+            cached = [self._cache_lookup(key, version) for key in keys]
+
+        pending = [check for check, result in zip(checks, cached) if result is None]
+        fresh = iter(run_checks(pending) if pending else [])
+
+        results = []
+        with self._cache_lock:
+            for key, result in zip(keys, cached):
+                if result is None:
+                    result = next(fresh)
+                    self._cache_store(key, result, version)
+                results.append(result)
+        return results
+
+    def _execute_checks(self, cursor, keys: Tuple, compose: Callable[[], Tuple[sql.Composed, List[Any]]]) -> Tuple:
+        """Run the fused query for a set of checks, preparing it only if it belongs to the suite"""
+        statement = self._statements.get(keys)
+        if statement is None:
+            # Ad-hoc, partially cached and retried check sets come in open-ended shapes, so
+            # run them as plain parameterised queries rather than holding them on every session
+            cursor.execute(*compose())
+            return cursor.fetchone()
+        return self._execute_prepared(cursor, statement)
+
+    def _execute_prepared(self, cursor, statement: FusedStatement) -> Tuple:
+        if statement.name is None:
+            # Name the statement after its bound text so any checker sharing the pool's sessions
+            # gets the same name for the same SQL; binding needs a cursor, so do it on first use
+            text = cursor.mogrify(statement.query, statement.params)
+            with self._cache_lock:
+                statement.text = text
+                statement.name = f"dq_check_{hashlib.sha1(text).hexdigest()[:16]}"
+
+        # Each session prepares the statement the first time it executes it
+        prepared = self.db.prepared_statements(cursor.connection)
+        if statement.name not in prepared:
+            cursor.execute(b"PREPARE " + statement.name.encode() + b" AS " + statement.text)
+            prepared.add(statement.name)
+        cursor.execute(sql.SQL("EXECUTE {}").format(sql.Identifier(statement.name)))
+        return cursor.fetchone()
+
+    def _table_identifier(self, table_name: str) -> sql.Identifier:
+        # Quote schema and table separately so 'core.customer' becomes "core"."customer"
+        return sql.Identifier(*table_name.split('.'))
+
+    def _table_version(self, cursor, tables: List[str]) -> Optional[Tuple[Tuple[str, int], ...]]:
+        # Cumulative row modification counters only grow, so each table's total changes whenever it does.
+        # Writes to a partitioned table are counted on its leaf partitions, so sum over the partition tree
+        cursor.execute("""
+            SELECT t.table_name, SUM(s.n_tup_ins + s.n_tup_upd + s.n_tup_del)
+            FROM unnest(%s::text[]) AS t(table_name)
+            CROSS JOIN LATERAL pg_partition_tree(t.table_name::regclass) p
+            LEFT JOIN pg_stat_user_tables s ON s.relid = p.relid
+            GROUP BY t.table_name
+            ORDER BY t.table_name
+        """, (sorted(set(tables)),))
+        version = tuple(cursor.fetchall())
+        if any(modifications is None for _, modifications in version):
+            return None
+        return version
+
+    def _cache_lookup(self, key: Tuple, version: Tuple) -> Optional[QualityCheckResult]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        result, cached_version, cached_at = entry
+        if cached_version != version or time.monotonic() - cached_at > self.cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return result
+
+    def _cache_store(self, key: Tuple, result: QualityCheckResult, version: Tuple):
+        self._cache[key] = (result, version, time.monotonic())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _consistency_result(self, table_name: str, column_name: str, reference_table: str, reference_column: str,
+                            total_count: int, orphaned_count: int) -> QualityCheckResult:
+        # Calculate consistency percentage
+        consistency = ((total_count - orphaned_count) / total_count) * 100 if total_count > 0 else 0
+        passed = consistency == 100  # Must be 100% for referential integrity
+
+        result = QualityCheckResult(
+            check_type=QualityCheckType.CONSISTENCY,
+            table_name=table_name,
+            column_name=column_name,
+            check_date=datetime.now(),
+            passed=passed,
+            details={
+                'consistency_percentage': consistency,
+                'orphaned_count': orphaned_count,
+                'reference_table': reference_table,
+                'reference_column': reference_column
+            },
+            error_count=orphaned_count,
+            total_count=total_count
+        )
+
+        logger.info("Consistency check for %s.%s: %.2f%%", table_name, column_name, consistency)
+        return result
+
+    def _completeness_condition(self, column_name: str) -> Tuple[sql.Composable, List[Any]]:
+        return sql.SQL("{} IS NOT NULL").format(sql.Identifier(column_name)), []
+
+    def _completeness_result(self, table_name: str, column_name: str, total_count: int, non_null_count: int) -> QualityCheckResult:
+        # Calculate completeness percentage
+        completeness = (non_null_count / total_count) * 100 if total_count > 0 else 0
+        passed = completeness >= 95  # Threshold of 95%
+
+        result = QualityCheckResult(
+            check_type=QualityCheckType.COMPLETENESS,
+            table_name=table_name,
+            column_name=column_name,
+            check_date=datetime.now(),
+            passed=passed,
+            details={
+                'completeness_percentage': completeness,
+                'null_count': total_count - non_null_count,
+                'non_null_count': non_null_count
+            },
+            error_count=total_count - non_null_count,
+            total_count=total_count
+        )
+
+        logger.info("Completeness check for %s.%s: %.2f%%", table_name, column_name, completeness)
+        return result
+
+    def _accuracy_condition(self, column_name: str, validation_rules: Dict[str, Any]) -> Tuple[sql.Composable, List[Any]]:
+        # Build validation condition based on rules
+        column = sql.Identifier(column_name)
+        validation_conditions = []
+        params = []
+        for rule, value in validation_rules.items():
+            if rule == 'min':
+                validation_conditions.append(sql.SQL("{} >= %s").format(column))
+                params.append(value)
+            elif rule == 'max':
+                validation_conditions.append(sql.SQL("{} <= %s").format(column))
+                params.append(value)
+            elif rule == 'allowed_values':
+                validation_conditions.append(sql.SQL("{} = ANY(%s)").format(column))
+                params.append(list(value))
+
+        return sql.SQL(' AND ').join(validation_conditions), params
+
+    def _accuracy_result(self, table_name: str, column_name: str, validation_rules: Dict[str, Any],
+                         total_count: int, valid_count: int) -> QualityCheckResult:
+        # Calculate accuracy percentage
+        accuracy = (valid_count / total_count) * 100 if total_count > 0 else 0
+        passed = accuracy >= 98  # Threshold of 98%
+
+        result = QualityCheckResult(
+            check_type=QualityCheckType.ACCURACY,
+            table_name=table_name,
+            column_name=column_name,
+            check_date=datetime.now(),
+            passed=passed,
+            details={
+                'accuracy_percentage': accuracy,
+                'invalid_count': total_count - valid_count,
+                'valid_count': valid_count,
+                'validation_rules': validation_rules
+            },
+            error_count=total_count - valid_count,
+            total_count=total_count
+        )
+
+        logger.info("Accuracy check for %s.%s: %.2f%%", table_name, column_name, accuracy)
+        return result
+
+    def _validity_condition(self, column_name: str, data_type: str) -> Tuple[sql.Composable, List[Any]]:
+        # Build type validation condition
+        if data_type not in VALIDITY_PATTERNS:
+            raise ValueError(f"Unsupported data type: {data_type}")
+
+        column = sql.Identifier(column_name)
+        if self.db.server_version >= 160000:
+            # Use the server's own input parser for the target type
+            return sql.SQL("pg_input_is_valid({}::text, %s)").format(column), [data_type]
+        else:
+            # pg_input_is_valid needs PostgreSQL 16; match the text form instead, which never raises
+            return sql.SQL("{}::text ~ %s").format(column), [VALIDITY_PATTERNS[data_type]]
+
+    def _validity_result(self, table_name: str, column_name: str, data_type: str,
+                         total_count: int, valid_count: int) -> QualityCheckResult:
+        # Calculate validity percentage
+        validity = (valid_count / total_count) * 100 if total_count > 0 else 0
+        passed = validity == 100  # Must be 100% for data type validity
+
+        result = QualityCheckResult(
+            check_type=QualityCheckType.VALIDITY,
+            table_name=table_name,
+            column_name=column_name,
+            check_date=datetime.now(),
+            passed=passed,
+            details={
+                'validity_percentage': validity,
+                'invalid_count': total_count - valid_count,
+                'valid_count': valid_count,
+                'data_type': data_type
+            },
+            error_count=total_count - valid_count,
+            total_count=total_count
+        )
+
+        logger.info("Validity check for %s.%s: %.2f%%", table_name, column_name, validity)
+        return result
+
+    def _timeliness_condition(self, date_column: str, max_age_hours: int) -> Tuple[sql.Composable, List[Any]]:
+        return sql.SQL("{} >= NOW() - %s * INTERVAL '1 hour'").format(sql.Identifier(date_column)), [max_age_hours]
+
+    def _timeliness_result(self, table_name: str, date_column: str, max_age_hours: int,
+                           total_count: int, recent_count: int) -> QualityCheckResult:
+        # Calculate timeliness percentage
+        timeliness = (recent_count / total_count) * 100 if total_count > 0 else 0
+        passed = timeliness >= 95  # Threshold of 95%
+
+        result = QualityCheckResult(
+            check_type=QualityCheckType.TIMELINESS,
+            table_name=table_name,
+            column_name=date_column,
+            check_date=datetime.now(),
+            passed=passed,
+            details={
+                'timeliness_percentage': timeliness,
+                'outdated_count': total_count - recent_count,
+                'recent_count': recent_count,
+                'max_age_hours': max_age_hours
+            },
+            error_count=total_count - recent_count,
+            total_count=total_count
+        )
+
+        logger.info("Timeliness check for %s.%s: %.2f%%", table_name, date_column, timeliness)
+        return result
 
     def run_quality_checks(self):
         """Run all quality checks"""
         try:
             logger.info("Starting data quality checks")
 
-            # Define checks to run
-            checks = [
-                # Completeness checks
-                (self.check_completeness, 'core.customer', 'email'),
-                (self.check_completeness, 'core.customer', 'phone'),
-                (self.check_completeness, 'core.transaction', 'amount'),
-
-                # Accuracy checks
-                (self.check_accuracy, 'core.customer', 'satisfaction_score', {'min': 0, 'max': 10}),
-                (self.check_accuracy, 'core.customer', 'nps_score', {'min': 0, 'max': 10}),
-                (self.check_accuracy, 'core.transaction', 'status', {'allowed_values': ['COMPLETED', 'PENDING', 'FAILED']}),
-
-                # Consistency checks
-                (self.check_consistency, 'core.transaction', 'customer_id', 'core.customer', 'customer_id'),
-                (self.check_consistency, 'core.transaction', 'branch_id', 'core.branch', 'branch_id'),
-                (self.check_consistency, 'core.transaction', 'product_id', 'core.product', 'product_id'),
-
-                # Validity checks
-                (self.check_validity, 'core.transaction', 'amount', 'numeric'),
-                (self.check_validity, 'core.customer', 'date_of_birth', 'date'),
-                (self.check_validity, 'core.transaction', 'transaction_date', 'date'),
-
-                # Timeliness checks
-                (self.check_timeliness, 'core.transaction', 'transaction_date', 24),
-                (self.check_timeliness, 'core.customer', 'last_interaction_date', 30 * 24)
-            ]
-
-            # Run all checks
-            for check_func, *args in checks:
-                try:
-                    result = check_func(*args)
-                    self.results.append(result)
-                    if not result.passed:
-                        logger.warning(f"Quality check failed: {result.check_type.value} for {result.table_name}.{result.column_name}")
-                except Exception as e:
-                    logger.error(f"Error running check {check_func.__name__}: {str(e)}")
+            # The suite was grouped by table when the checker was constructed
+            tasks = [(self.run_column_checks, table_name, table_checks) for table_name, table_checks in self._column_suite.items()]
+            tasks += [(self.run_consistency_checks, table_name, references) for table_name, references in self._consistency_suite.items()]
+
+            # Run all checks concurrently; each worker borrows its own pooled connection
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(run_checks, table_name, table_checks): (run_checks, table_name, table_checks)
+                           for run_checks, table_name, table_checks in tasks}
+                for future in as_completed(futures):
+                    run_checks, table_name, table_checks = futures[future]
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        # One bad rule fails the whole fused scan, so retry its checks individually
+                        logger.error("Fused %s for %s failed, retrying %d checks individually: %s",
+                                     run_checks.__name__, table_name, len(table_checks), e)
+                        results = self._run_checks_individually(run_checks, table_name, table_checks)
+
+                    for result in results:
+                        self.results.append(result)
+                        if not result.passed:
+                            logger.warning("Quality check failed: %s for %s.%s", result.check_type.value, result.table_name, result.column_name)
 
             # Generate quality report
             self.generate_quality_report()
@@ -364,14 +572,36 @@ class DataQualityChecker:
             logger.error(f"Error in quality checks: {str(e)}")
             raise
 
+    def _run_checks_individually(self, run_checks: Callable, table_name: str, checks: List[Tuple]) -> List[QualityCheckResult]:
+        check_key = self._column_check_key if run_checks == self.run_column_checks else self._consistency_check_key
+        results = []
+        for check in checks:
+            try:
+                results.extend(run_checks(table_name, [check]))
+            except Exception as e:
+                logger.error("Error running check %s: %s", check_key(table_name, check), e)
+        return results
+
+    def _group_checks(self, checks: List[Tuple]) -> Tuple[Dict[str, List[Tuple]], Dict[str, List[Tuple]]]:
+        """Group checks by table so each table is scanned once per kind of check"""
+        column_checks: Dict[str, List[Tuple]] = {}
+        consistency_checks: Dict[str, List[Tuple]] = {}
+        for check_func, table_name, *args in checks:
+            if check_func == self.check_consistency:
+                consistency_checks.setdefault(table_name, []).append(tuple(args))
+            else:
+                column_checks.setdefault(table_name, []).append((check_func, *args))
+        return column_checks, consistency_checks
+
     def generate_quality_report(self):
         """Generate a quality report from check results"""
         try:
+            passed_checks = sum(r.passed for r in self.results)
             report = {
                 'timestamp': datetime.now().isoformat(),
                 'total_checks': len(self.results),
-                'passed_checks': sum(1 for r in self.results if r.passed),
-                'failed_checks': sum(1 for r in self.results if not r.passed),
+                'passed_checks': passed_checks,
+                'failed_checks': len(self.results) - passed_checks,
                 'check_details': []
             }
 
@@ -381,14 +611,14 @@ class DataQualityChecker:
                     'table_name': result.table_name,
                     'column_name': result.column_name,
                     'passed': result.passed,
-                    'error_rate': (result.error_count / result.total_count) * 100 if result.total_count > 0 else 0,
+                    'error_rate': result.error_rate,
                     'details': result.details
                 }
                 report['check_details'].append(check_detail)
 
             # Save report to file
-            with open('quality_report.json', 'w') as f:
-                json.dump(report, f, indent=4)
+            with open('quality_report.json', 'wb') as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
 
             logger.info("Quality report generated successfully")
         except Exception as e:
@@ -407,7 +637,10 @@ def main():
     quality_checker = DataQualityChecker(db_connection)
 
     # Run quality checks
-    quality_checker.run_quality_checks()
+    try:
+        quality_checker.run_quality_checks()
+    finally:
+        db_connection.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
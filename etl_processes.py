@@ -1,6 +1,10 @@
 import pandas as pd
-import psycopg2
+import numpy as np
+from psycopg2.pool import ThreadedConnectionPool
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+import io
 import logging
 import json
 import os
@@ -19,8 +23,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+TRANSACTION_STATUSES = np.array(['COMPLETED', 'PENDING', 'FAILED'])
+TRANSACTION_STATUS_DTYPE = pd.CategoricalDtype(TRANSACTION_STATUSES)
+
+# Column order shared by the staging COPY and merge statements
+TRANSACTION_COLUMNS = [
+    'transaction_id', 'transaction_date', 'transaction_time',
+    'branch_id', 'customer_id', 'product_id', 'amount',
+    'transaction_type_id', 'employee_id', 'channel_id',
+    'status', 'is_weekend', 'is_holiday'
+]
+CUSTOMER_COLUMNS = [
+    'customer_id', 'first_name', 'last_name', 'date_of_birth',
+    'address', 'city', 'state', 'zip_code', 'email', 'phone',
+    'customer_segment_id', 'acquisition_date', 'last_interaction_date',
+    'satisfaction_score', 'nps_score', 'status', 'age', 'customer_tenure_days'
+]
+
 class DatabaseConnection:
-    def __init__(self, dbname: str, user: str, password: str, host: str = 'localhost', port: str = '5432'):
+    def __init__(self, dbname: str, user: str, password: str, host: str = 'localhost', port: str = '5432',
+                 minconn: int = 2, maxconn: int = 16):
         self.connection_params = {
             'dbname': dbname,
             'user': user,
@@ -28,44 +50,57 @@ class DatabaseConnection:
             'host': host,
             'port': port
         }
-
-    def connect(self):
         try:
-            conn = psycopg2.connect(**self.connection_params)
-            logger.info("Successfully connected to database")
-            return conn
+            self.pool = ThreadedConnectionPool(minconn, maxconn, **self.connection_params)
         except Exception as e:
             logger.error(f"Error connecting to database: {str(e)}")
             raise
 
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection, committing on success and rolling back on error"""
+        conn = self.pool.getconn()
+        logger.debug("Borrowed pooled database connection")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.pool.putconn(conn)
+
+    def close(self):
+        self.pool.closeall()
+
 class ETLProcess:
     def __init__(self, db_connection: DatabaseConnection):
         self.db = db_connection
         self.fake = Faker()
+        self.rng = np.random.default_rng()
 
     def extract_transactions(self, start_date: datetime, end_date: datetime) -> pd.DataFrame:
         """Extract transaction data from source system"""
         try:
             # In a real implementation, this would connect to the actual source system
-            # For demonstration, we'll generate synthetic data
-            transactions = []
-            for _ in range(1000):
-                transaction = {
-                    'transaction_id': self.fake.random_number(digits=8),
-                    'transaction_date': self.fake.date_between(start_date=start_date, end_date=end_date),
-                    'transaction_time': self.fake.time(),
-                    'branch_id': self.fake.random_number(digits=4),
-                    'customer_id': self.fake.random_number(digits=6),
-                    'product_id': self.fake.random_number(digits=4),
-                    'amount': round(self.fake.random_number(digits=4) + self.fake.random_number(digits=2) / 100, 2),
-                    'transaction_type_id': self.fake.random_number(digits=2),
-                    'employee_id': self.fake.random_number(digits=4),
-                    'channel_id': self.fake.random_number(digits=2),
-                    'status': self.fake.random_element(['COMPLETED', 'PENDING', 'FAILED'])
-                }
-                transactions.append(transaction)
-            
-            df = pd.DataFrame(transactions)
+            # For demonstration, we'll generate synthetic data one column at a time
+            n = 1000
+            df = pd.DataFrame({
+                'transaction_id': self.rng.integers(0, 10 ** 8, n),
+                'transaction_date': pd.to_datetime(
+                    self.rng.integers(pd.Timestamp(start_date).value, pd.Timestamp(end_date).value, n)
+                ).normalize(),
+                'transaction_time': pd.to_datetime(self.rng.integers(0, 24 * 60 * 60, n), unit='s').strftime('%H:%M:%S'),
+                'branch_id': self.rng.integers(0, 10 ** 4, n),
+                'customer_id': self.rng.integers(0, 10 ** 6, n),
+                'product_id': self.rng.integers(0, 10 ** 4, n),
+                'amount': np.round(self.rng.integers(0, 10 ** 6, n) / 100, 2),
+                'transaction_type_id': self.rng.integers(0, 10 ** 2, n),
+                'employee_id': self.rng.integers(0, 10 ** 4, n),
+                'channel_id': self.rng.integers(0, 10 ** 2, n),
+                'status': self.rng.choice(TRANSACTION_STATUSES, n)
+            })
+
             logger.info(f"Extracted {len(df)} transactions")
             return df
         except Exception as e:
@@ -76,30 +111,30 @@ class ETLProcess:
         """Extract customer data from CRM system"""
         try:
             # In a real implementation, this would connect to the CRM API
-            # For demonstration, we'll generate synthetic data
-            customers = []
-            for _ in range(500):
-                customer = {
-                    'customer_id': self.fake.random_number(digits=6),
-                    'first_name': self.fake.first_name(),
-                    'last_name': self.fake.last_name(),
-                    'date_of_birth': self.fake.date_of_birth(minimum_age=18, maximum_age=90),
-                    'address': self.fake.street_address(),
-                    'city': self.fake.city(),
-                    'state': self.fake.state(),
-                    'zip_code': self.fake.zipcode(),
-                    'email': self.fake.email(),
-                    'phone': self.fake.phone_number(),
-                    'customer_segment_id': self.fake.random_number(digits=2),
-                    'acquisition_date': self.fake.date_between(start_date='-5y', end_date='today'),
-                    'last_interaction_date': self.fake.date_time_between(start_date='-1y', end_date='now'),
-                    'satisfaction_score': self.fake.random_int(min=0, max=10),
-                    'nps_score': self.fake.random_int(min=0, max=10),
-                    'status': self.fake.random_element(['ACTIVE', 'INACTIVE', 'PENDING'])
-                }
-                customers.append(customer)
-            
-            df = pd.DataFrame(customers)
+            # For demonstration, we'll generate synthetic data one column at a time,
+            # keeping Faker only for the locale-aware text fields
+            n = 500
+            now = pd.Timestamp.now()
+            today = now.normalize()
+            df = pd.DataFrame({
+                'customer_id': self.rng.integers(0, 10 ** 6, n),
+                'first_name': [self.fake.first_name() for _ in range(n)],
+                'last_name': [self.fake.last_name() for _ in range(n)],
+                'date_of_birth': today - pd.to_timedelta(self.rng.integers(18 * 365, 91 * 365, n), unit='D'),
+                'address': [self.fake.street_address() for _ in range(n)],
+                'city': [self.fake.city() for _ in range(n)],
+                'state': [self.fake.state() for _ in range(n)],
+                'zip_code': [self.fake.zipcode() for _ in range(n)],
+                'email': [self.fake.email() for _ in range(n)],
+                'phone': [self.fake.phone_number() for _ in range(n)],
+                'customer_segment_id': self.rng.integers(0, 10 ** 2, n),
+                'acquisition_date': today - pd.to_timedelta(self.rng.integers(0, 5 * 365, n), unit='D'),
+                'last_interaction_date': now - pd.to_timedelta(self.rng.integers(0, 365 * 24 * 60 * 60, n), unit='s'),
+                'satisfaction_score': self.rng.integers(0, 11, n),
+                'nps_score': self.rng.integers(0, 11, n),
+                'status': self.rng.choice(['ACTIVE', 'INACTIVE', 'PENDING'], n)
+            })
+
             logger.info(f"Extracted {len(df)} customers")
             return df
         except Exception as e:
@@ -111,15 +146,20 @@ class ETLProcess:
         try:
             # Convert date columns to datetime
             df['transaction_date'] = pd.to_datetime(df['transaction_date'])
-            df['transaction_time'] = pd.to_datetime(df['transaction_time']).dt.time
+            df['transaction_time'] = pd.to_datetime(df['transaction_time'], format='%H:%M:%S').dt.time
 
-            # Add derived columns
-            df['is_weekend'] = df['transaction_date'].dt.dayofweek.isin([5, 6])
-            df['is_holiday'] = df['transaction_date'].dt.dayofweek.isin([5, 6])  # Simplified holiday check
+            # Add derived columns; 1970-01-01 was a Thursday, so (days + 3) % 7 is Monday-based
+            days = df['transaction_date'].to_numpy().astype('datetime64[D]').astype('int64')
+            df['is_weekend'] = (days + 3) % 7 >= 5
+            df['is_holiday'] = df['is_weekend']  # Simplified holiday check
 
-            # Validate data
-            df = df[df['amount'] >= 0]  # Remove negative amounts
-            df = df[df['status'].isin(['COMPLETED', 'PENDING', 'FAILED'])]
+            # Store low-cardinality columns compactly; unknown statuses become NaN
+            df['status'] = df['status'].astype(TRANSACTION_STATUS_DTYPE)
+            df['transaction_type_id'] = self._compact_ids(df['transaction_type_id'])
+            df['channel_id'] = self._compact_ids(df['channel_id'])
+
+            # Validate data in a single pass: drop negative amounts and unknown statuses
+            df = df[(df['amount'] >= 0) & df['status'].isin(TRANSACTION_STATUSES)]
 
             logger.info(f"Transformed {len(df)} transactions")
             return df
@@ -135,13 +175,24 @@ class ETLProcess:
             df['acquisition_date'] = pd.to_datetime(df['acquisition_date'])
             df['last_interaction_date'] = pd.to_datetime(df['last_interaction_date'])
 
-            # Add derived columns
-            df['age'] = (datetime.now() - df['date_of_birth']).dt.years
-            df['customer_tenure_days'] = (datetime.now() - df['acquisition_date']).dt.days
+            # Add derived columns with day-resolution NumPy arithmetic
+            # Missing dates are masked so they reach staging as NULL rather than garbage
+            today = np.datetime64(datetime.now(), 'D')
+            date_of_birth = df['date_of_birth'].to_numpy().astype('datetime64[D]')
+            age_missing = np.isnat(date_of_birth)
+            age_days = np.where(age_missing, 0, (today - date_of_birth).astype('int64'))
+            df['age'] = pd.arrays.IntegerArray((age_days / 365.25).astype('int16'), age_missing)
+            acquisition_date = df['acquisition_date'].to_numpy().astype('datetime64[D]')
+            tenure_missing = np.isnat(acquisition_date)
+            tenure_days = np.where(tenure_missing, 0, (today - acquisition_date).astype('int64'))
+            df['customer_tenure_days'] = pd.arrays.IntegerArray(tenure_days.astype('int32'), tenure_missing)
+
+            # Store low-cardinality columns compactly
+            df['status'] = df['status'].astype('category')
+            df['customer_segment_id'] = self._compact_ids(df['customer_segment_id'])
 
-            # Validate data
-            df = df[df['satisfaction_score'].between(0, 10)]
-            df = df[df['nps_score'].between(0, 10)]
+            # Validate data in a single pass
+            df = df[df['satisfaction_score'].between(0, 10) & df['nps_score'].between(0, 10)]
 
             logger.info(f"Transformed {len(df)} customers")
             return df
@@ -149,79 +200,90 @@ class ETLProcess:
             logger.error(f"Error transforming customers: {str(e)}")
             raise
 
-    def load_transactions(self, df: pd.DataFrame):
+    def load_transactions(self, cursor, df: pd.DataFrame):
         """Load transformed transaction data into warehouse"""
         try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
+            columns = ", ".join(TRANSACTION_COLUMNS)
+            # Duplicate keys within one upsert statement are rejected by Postgres
+            df = df.drop_duplicates(subset='transaction_id', keep='last')
 
-            # Insert into staging table
-            for _, row in df.iterrows():
+            with self._savepoint(cursor, 'load_transactions'):
+                # Bulk load into a session-local copy of the staging table
                 cursor.execute("""
-                    INSERT INTO staging.transactions (
-                        transaction_id, transaction_date, transaction_time,
-                        branch_id, customer_id, product_id, amount,
-                        transaction_type_id, employee_id, channel_id,
-                        status, is_weekend, is_holiday
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    CREATE TEMP TABLE transactions_tmp (LIKE staging.transactions INCLUDING DEFAULTS) ON COMMIT DROP
+                """)
+                buffer = io.StringIO()
+                df[TRANSACTION_COLUMNS].to_csv(buffer, index=False, header=False)
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY transactions_tmp ({columns}) FROM STDIN WITH (FORMAT CSV)", buffer)
+
+                # Merge into staging table
+                cursor.execute(f"""
+                    INSERT INTO staging.transactions ({columns})
+                    SELECT {columns} FROM transactions_tmp
                     ON CONFLICT (transaction_id) DO UPDATE SET
                         status = EXCLUDED.status,
                         last_updated = CURRENT_TIMESTAMP
-                """, (
-                    row['transaction_id'], row['transaction_date'], row['transaction_time'],
-                    row['branch_id'], row['customer_id'], row['product_id'], row['amount'],
-                    row['transaction_type_id'], row['employee_id'], row['channel_id'],
-                    row['status'], row['is_weekend'], row['is_holiday']
-                ))
+                """)
 
-            conn.commit()
             logger.info(f"Loaded {len(df)} transactions")
         except Exception as e:
             logger.error(f"Error loading transactions: {str(e)}")
-            conn.rollback()
             raise
-        finally:
-            cursor.close()
-            conn.close()
 
-    def load_customers(self, df: pd.DataFrame):
+    def load_customers(self, cursor, df: pd.DataFrame):
         """Load transformed customer data into warehouse"""
         try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
+            columns = ", ".join(CUSTOMER_COLUMNS)
+            # Duplicate keys within one upsert statement are rejected by Postgres
+            df = df.drop_duplicates(subset='customer_id', keep='last')
 
-            # Insert into staging table
-            for _, row in df.iterrows():
+            with self._savepoint(cursor, 'load_customers'):
+                # Bulk load into a session-local copy of the staging table
                 cursor.execute("""
-                    INSERT INTO staging.customers (
-                        customer_id, first_name, last_name, date_of_birth,
-                        address, city, state, zip_code, email, phone,
-                        customer_segment_id, acquisition_date, last_interaction_date,
-                        satisfaction_score, nps_score, status, age, customer_tenure_days
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    CREATE TEMP TABLE customers_tmp (LIKE staging.customers INCLUDING DEFAULTS) ON COMMIT DROP
+                """)
+                buffer = io.StringIO()
+                df[CUSTOMER_COLUMNS].to_csv(buffer, index=False, header=False)
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY customers_tmp ({columns}) FROM STDIN WITH (FORMAT CSV)", buffer)
+
+                # Merge into staging table
+                cursor.execute(f"""
+                    INSERT INTO staging.customers ({columns})
+                    SELECT {columns} FROM customers_tmp
                     ON CONFLICT (customer_id) DO UPDATE SET
                         last_interaction_date = EXCLUDED.last_interaction_date,
                         satisfaction_score = EXCLUDED.satisfaction_score,
                         nps_score = EXCLUDED.nps_score,
                         status = EXCLUDED.status,
                         last_updated = CURRENT_TIMESTAMP
-                """, (
-                    row['customer_id'], row['first_name'], row['last_name'], row['date_of_birth'],
-                    row['address'], row['city'], row['state'], row['zip_code'], row['email'],
-                    row['phone'], row['customer_segment_id'], row['acquisition_date'],
-                    row['last_interaction_date'], row['satisfaction_score'], row['nps_score'],
-                    row['status'], row['age'], row['customer_tenure_days']
-                ))
+                """)
 
-            conn.commit()
             logger.info(f"Loaded {len(df)} customers")
         except Exception as e:
             logger.error(f"Error loading customers: {str(e)}")
-            conn.rollback()
             raise
-        finally:
-            cursor.close()
-            conn.close()
+
+    @contextmanager
+    def _savepoint(self, cursor, name: str):
+        """Run one load phase under a savepoint of the surrounding transaction"""
+        cursor.execute(f"SAVEPOINT {name}")
+        try:
+            yield
+        except Exception:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            raise
+        cursor.execute(f"RELEASE SAVEPOINT {name}")
+
+    def _compact_ids(self, ids: pd.Series) -> pd.Series:
+        """Narrow an id column to nullable Int16, keeping Int64 when values fall outside its range"""
+        ids = pd.to_numeric(ids)
+        limits = np.iinfo(np.int16)
+        if ids.min() < limits.min or ids.max() > limits.max:
+            logger.warning(f"{ids.name} exceeds the Int16 range; keeping it as Int64")
+            return ids.astype('Int64')
+        return ids.astype('Int16')
 
     def run_daily_etl(self):
         """Run daily ETL process"""
@@ -233,12 +295,21 @@ class ETLProcess:
             end_date = datetime.now()
             transactions_df = self.extract_transactions(start_date, end_date)
             transformed_transactions = self.transform_transactions(transactions_df)
-            self.load_transactions(transformed_transactions)
 
-            # Extract and transform customers
-            customers_df = self.extract_customers()
-            transformed_customers = self.transform_customers(customers_df)
-            self.load_customers(transformed_customers)
+            # Load both feeds in one transaction so a failure in either leaves staging untouched
+            with self.db.connection() as conn, conn.cursor() as cursor:
+                # Load transactions in the background so the database round-trips
+                # overlap with the customer extract and transform
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    transactions_load = executor.submit(self.load_transactions, cursor, transformed_transactions)
+
+                    # Extract and transform customers
+                    customers_df = self.extract_customers()
+                    transformed_customers = self.transform_customers(customers_df)
+
+                    transactions_load.result()
+
+                self.load_customers(cursor, transformed_customers)
 
             logger.info("Daily ETL process completed successfully")
         except Exception as e:
@@ -257,7 +328,10 @@ def main():
     etl = ETLProcess(db_connection)
 
     # Run daily ETL
-    etl.run_daily_etl()
+    try:
+        etl.run_daily_etl()
+    finally:
+        db_connection.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file